@@ -0,0 +1,185 @@
+"""Local catalog of the Landsat scenes covering the Llanos.
+
+The catalog lets the web server pick the best scene for each WRS path/row in a
+given year without asking Earth Engine to search the full Landsat archive. It
+is a small columnar table with one row per scene:
+
+  scene_id   e.g. 'LE70040562000023EDC00'
+  sensor     'LT5', 'LE7' or 'LC8'
+  path, row  the WRS-2 path/row of the scene
+  date       the acquisition date
+  cloud      the scene cloud score (0-100, lower is clearer, or -1 if unknown)
+
+On disk the table is a JSON object with one list per column (see Save()). In
+memory each numeric column is an array.array, sorted by path, row and date, so
+the scenes of one path/row form a contiguous, date-ordered slice. Queries by
+path/row and year are a dict lookup plus two binary searches.
+
+The catalog is written by sync_catalog.py and only read by the server.
+"""
+
+import array
+import bisect
+import collections
+import datetime
+import json
+import os
+
+# The catalog file, written by sync_catalog.py and read by server.py.
+CATALOG_PATH = os.path.join(os.path.dirname(__file__), 'scene_catalog.json')
+
+# The years covered by the catalog and shown on the map, inclusive.
+FIRST_YEAR = 2000
+LAST_YEAR = 2014
+
+# The WRS-2 path/rows that cover the Llanos.
+LLANOS_PATH_ROWS = [
+    (4, 56), (4, 57),
+    (5, 55), (5, 56), (5, 57),
+    (6, 55), (6, 56), (6, 57), (6, 58),
+    (7, 56), (7, 57), (7, 58),
+]
+
+# The sensors we know about, in the order they are encoded in the catalog.
+SENSORS = ('LT5', 'LE7', 'LC8')
+
+# The EE collection with each sensor's TOA scenes and their cloud cover.
+TOA_COLLECTION_IDS = {
+    'LT5': 'LANDSAT/LT5_L1T_TOA',
+    'LE7': 'LANDSAT/LE7_L1T_TOA',
+    'LC8': 'LANDSAT/LC8_L1T_TOA',
+}
+
+# The EE collection holding the imagery shown on the map for each sensor.
+MAP_COLLECTION_IDS = {
+    'LT5': 'LEDAPS/LT5_L1T_SR',
+    'LE7': 'LEDAPS/LE7_L1T_SR',
+    'LC8': 'LANDSAT/LC8_L1T_TOA',
+}
+
+# The cloud score of scenes whose cloud cover is unknown. This matches the
+# CLOUD_COVER value Landsat metadata uses for unscored scenes.
+UNKNOWN_CLOUD = -1
+
+# The columns of the on-disk catalog, in order.
+COLUMNS = ('scene_id', 'sensor', 'path', 'row', 'date', 'cloud')
+
+# A single catalog row, as returned by queries.
+Scene = collections.namedtuple('Scene', COLUMNS)
+
+
+class SceneCatalog(object):
+  """An in-memory, array-backed table of Landsat scenes."""
+
+  def __init__(self, scenes):
+    """Builds the catalog from an iterable of Scene tuples."""
+    scenes = sorted(scenes, key=lambda s: (s.path, s.row, s.date, s.scene_id))
+    self._scene_ids = [s.scene_id for s in scenes]
+    self._sensors = array.array('B', [SENSORS.index(s.sensor) for s in scenes])
+    self._paths = array.array('B', [s.path for s in scenes])
+    self._rows = array.array('B', [s.row for s in scenes])
+    self._dates = array.array('l', [s.date.toordinal() for s in scenes])
+    self._clouds = array.array('f', [s.cloud for s in scenes])
+
+    # Maps (path, row) to the [start, end) slice holding its scenes.
+    self._path_rows = collections.OrderedDict()
+    for i, path_row in enumerate(zip(self._paths, self._rows)):
+      start, _ = self._path_rows.get(path_row, (i, i))
+      self._path_rows[path_row] = (start, i + 1)
+
+  def __len__(self):
+    return len(self._scene_ids)
+
+  def PathRows(self):
+    """Returns the (path, row) pairs in the catalog, in sorted order."""
+    return list(self._path_rows)
+
+  def Scenes(self, year, sensors=SENSORS):
+    """Returns the scenes from the given sensors acquired in the given year."""
+    scenes = []
+    for path_row in self._path_rows:
+      for i in self._YearIndices(path_row, year, sensors):
+        scenes.append(self._Scene(i))
+    return scenes
+
+  def SceneIds(self, year, sensors=SENSORS):
+    """Returns the IDs of the scenes acquired in the given year."""
+    return [scene.scene_id for scene in self.Scenes(year, sensors)]
+
+  def BestScenes(self, year, sensors=SENSORS):
+    """Returns the clearest scene of the given year for each path/row.
+
+    Scenes with an unknown cloud score are only picked when a path/row has
+    nothing else, and ties on cloud score go to the earliest acquisition.
+    Path/rows without any scene from the given sensors in that year are left
+    out.
+    """
+    scenes = []
+    for path_row in self._path_rows:
+      indices = self._YearIndices(path_row, year, sensors)
+      if indices:
+        best = min(indices, key=self._CloudRank)
+        scenes.append(self._Scene(best))
+    return scenes
+
+  def _CloudRank(self, i):
+    """Returns the sort key ranking the scene at index i by clearness."""
+    cloud = self._clouds[i]
+    return (cloud < 0, cloud, self._dates[i])
+
+  def _YearIndices(self, path_row, year, sensors):
+    """Returns the row indices of a path/row's scenes in the given year."""
+    start, end = self._path_rows.get(path_row, (0, 0))
+    first = datetime.date(year, 1, 1).toordinal()
+    last = datetime.date(year, 12, 31).toordinal()
+    lo = bisect.bisect_left(self._dates, first, start, end)
+    hi = bisect.bisect_right(self._dates, last, lo, end)
+    codes = [SENSORS.index(sensor) for sensor in sensors]
+    return [i for i in range(lo, hi) if self._sensors[i] in codes]
+
+  def _Scene(self, i):
+    """Returns the catalog row at index i as a Scene."""
+    return Scene(
+        scene_id=self._scene_ids[i],
+        sensor=SENSORS[self._sensors[i]],
+        path=self._paths[i],
+        row=self._rows[i],
+        date=datetime.date.fromordinal(self._dates[i]),
+        cloud=self._clouds[i])
+
+
+def Load(path):
+  """Returns the SceneCatalog stored in the JSON file at the given path."""
+  with open(path) as f:
+    columns = json.load(f)
+  dates = [datetime.datetime.strptime(d, '%Y-%m-%d').date()
+           for d in columns['date']]
+  return SceneCatalog(
+      Scene(*values) for values in zip(
+          columns['scene_id'], columns['sensor'], columns['path'],
+          columns['row'], dates, columns['cloud']))
+
+
+def Save(scenes, path):
+  """Writes the given scenes to a JSON catalog file at the given path.
+
+  The file is written next to its destination and then moved into place, so a
+  reader never sees a partially written catalog. On Windows, where a rename
+  can't replace an existing file, the old catalog is removed first, so the
+  catalog briefly doesn't exist.
+  """
+  scenes = sorted(scenes, key=lambda s: (s.path, s.row, s.date, s.scene_id))
+  columns = collections.OrderedDict((name, []) for name in COLUMNS)
+  for scene in scenes:
+    columns['scene_id'].append(scene.scene_id)
+    columns['sensor'].append(scene.sensor)
+    columns['path'].append(scene.path)
+    columns['row'].append(scene.row)
+    columns['date'].append(scene.date.strftime('%Y-%m-%d'))
+    columns['cloud'].append(round(scene.cloud, 2))
+  tmp_path = path + '.tmp'
+  with open(tmp_path, 'w') as f:
+    json.dump(columns, f, separators=(',', ':'))
+  if os.name == 'nt' and os.path.exists(path):
+    os.remove(path)
+  os.rename(tmp_path, path)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""Tests for scene_catalog.py."""
+
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+import scene_catalog
+
+
+def MakeScene(scene_id, sensor, path, row, date, cloud):
+  """Returns a Scene acquired on the given (year, month, day)."""
+  return scene_catalog.Scene(
+      scene_id, sensor, path, row, datetime.date(*date), cloud)
+
+
+SCENES = [
+    MakeScene('LE70040561999365EDC00', 'LE7', 4, 56, (1999, 12, 31), 0.0),
+    MakeScene('LE70040562000001EDC00', 'LE7', 4, 56, (2000, 1, 1), 30.0),
+    MakeScene('LT50040562000100XXX02', 'LT5', 4, 56, (2000, 4, 9), 10.0),
+    MakeScene('LE70040562000366EDC00', 'LE7', 4, 56, (2000, 12, 31), 10.0),
+    MakeScene('LE70040562001001EDC00', 'LE7', 4, 56, (2001, 1, 1), 0.0),
+    MakeScene('LT50050572000050XXX02', 'LT5', 5, 57, (2000, 2, 19), -1),
+    MakeScene('LT50050572000066XXX02', 'LT5', 5, 57, (2000, 3, 6), 50.0),
+    MakeScene('LE70070582001062EDC00', 'LE7', 7, 58, (2001, 3, 3), 5.0),
+]
+
+
+class SceneCatalogTest(unittest.TestCase):
+
+  def setUp(self):
+    self.catalog = scene_catalog.SceneCatalog(reversed(SCENES))
+
+  def testPathRows(self):
+    self.assertEqual([(4, 56), (5, 57), (7, 58)], self.catalog.PathRows())
+
+  def testSceneIdsRespectYearBoundaries(self):
+    self.assertEqual(
+        ['LE70040562000001EDC00', 'LT50040562000100XXX02',
+         'LE70040562000366EDC00', 'LT50050572000050XXX02',
+         'LT50050572000066XXX02'],
+        self.catalog.SceneIds(2000))
+
+  def testSceneIdsFiltersBySensor(self):
+    self.assertEqual(
+        ['LT50040562000100XXX02', 'LT50050572000050XXX02',
+         'LT50050572000066XXX02'],
+        self.catalog.SceneIds(2000, ['LT5']))
+    self.assertEqual([], self.catalog.SceneIds(2000, ['LC8']))
+
+  def testBestScenesSkipsPathRowsWithoutScenesInYear(self):
+    best = self.catalog.BestScenes(2000)
+    self.assertEqual([(4, 56), (5, 57)], [(s.path, s.row) for s in best])
+    self.assertEqual([], self.catalog.BestScenes(2005))
+
+  def testBestScenesBreaksCloudTiesByDate(self):
+    best = self.catalog.BestScenes(2000)
+    self.assertEqual('LT50040562000100XXX02', best[0].scene_id)
+
+  def testBestScenesRanksUnknownCloudLast(self):
+    best = self.catalog.BestScenes(2000)
+    self.assertEqual('LT50050572000066XXX02', best[1].scene_id)
+
+  def testBestScenesPicksUnknownCloudWhenAlone(self):
+    catalog = scene_catalog.SceneCatalog(SCENES[5:6])
+    self.assertEqual(['LT50050572000050XXX02'],
+                     [s.scene_id for s in catalog.BestScenes(2000)])
+
+  def testBestScenesFiltersBySensor(self):
+    best = self.catalog.BestScenes(2000, ['LE7'])
+    self.assertEqual(['LE70040562000366EDC00'], [s.scene_id for s in best])
+
+
+class SaveLoadTest(unittest.TestCase):
+
+  def setUp(self):
+    self.tmp_dir = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.tmp_dir)
+
+  def testRoundTrip(self):
+    path = os.path.join(self.tmp_dir, 'scene_catalog.json')
+    scene_catalog.Save(SCENES, path)
+    catalog = scene_catalog.Load(path)
+    self.assertEqual(len(SCENES), len(catalog))
+    self.assertEqual(['scene_catalog.json'], os.listdir(self.tmp_dir))
+    for year in (1999, 2000, 2001):
+      self.assertEqual([s for s in SCENES if s.date.year == year],
+                       catalog.Scenes(year))
+
+  def testSaveReplacesExistingCatalog(self):
+    path = os.path.join(self.tmp_dir, 'scene_catalog.json')
+    scene_catalog.Save(SCENES, path)
+    scene_catalog.Save(SCENES[:2], path)
+    self.assertEqual(2, len(scene_catalog.Load(path)))
+    self.assertEqual(['scene_catalog.json'], os.listdir(self.tmp_dir))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -60,6 +60,7 @@ requests more quickly.
 """
 
 import json
+import logging
 import os
 
 import config
@@ -67,6 +68,7 @@ import config
 import ee
 import ee
 import jinja2
+import scene_catalog
 import webapp2
 
 from google.appengine.api import memcache
@@ -83,60 +85,14 @@ class MainHandler(webapp2.RequestHandler):
 
   def get(self, path=''):
     """Returns the main web page, populated with EE map and polygon info."""
-    mapid_2000 = GetTrendyMapId_2000()
-    mapid_2001 = GetTrendyMapId_2001()
-    mapid_2002 = GetTrendyMapId_2002()
-    mapid_2003 = GetTrendyMapId_2003()
-    mapid_2004 = GetTrendyMapId_2004()
-    mapid_2005 = GetTrendyMapId_2005()
-    mapid_2006 = GetTrendyMapId_2006()
-    mapid_2007 = GetTrendyMapId_2007()
-    mapid_2008 = GetTrendyMapId_2008()
-    mapid_2009 = GetTrendyMapId_2009()
-    mapid_2010 = GetTrendyMapId_2010()
-    mapid_2011 = GetTrendyMapId_2011()
-    mapid_2012 = GetTrendyMapId_2012()
-    mapid_2013 = GetTrendyMapId_2013()
-    mapid_2014 = GetTrendyMapId_2014()
-    #mapid_2015 = GetTrendyMapId_2015()
-    #mapid_2016 = GetTrendyMapId_2016()
-    template_values = {
-        'eeMapId_2000': mapid_2000['mapid'],
-        'eeToken_2000': mapid_2000['token'],
-        'eeMapId_2001': mapid_2001['mapid'],
-        'eeToken_2001': mapid_2001['token'],
-        'eeMapId_2002': mapid_2002['mapid'],
-        'eeToken_2002': mapid_2002['token'],
-        'eeMapId_2003': mapid_2003['mapid'],
-        'eeToken_2003': mapid_2003['token'],
-        'eeMapId_2004': mapid_2004['mapid'],
-        'eeToken_2004': mapid_2004['token'],
-        'eeMapId_2005': mapid_2005['mapid'],
-        'eeToken_2005': mapid_2005['token'],
-        'eeMapId_2006': mapid_2006['mapid'],
-        'eeToken_2006': mapid_2006['token'],
-        'eeMapId_2007': mapid_2007['mapid'],
-        'eeToken_2007': mapid_2007['token'],
-        'eeMapId_2008': mapid_2008['mapid'],
-        'eeToken_2008': mapid_2008['token'],
-        'eeMapId_2009': mapid_2009['mapid'],
-        'eeToken_2009': mapid_2009['token'],
-        'eeMapId_2010': mapid_2010['mapid'],
-        'eeToken_2010': mapid_2010['token'],
-        'eeMapId_2011': mapid_2011['mapid'],
-        'eeToken_2011': mapid_2011['token'],
-        'eeMapId_2012': mapid_2012['mapid'],
-        'eeToken_2012': mapid_2012['token'],
-        'eeMapId_2013': mapid_2013['mapid'],
-        'eeToken_2013': mapid_2013['token'],
-        'eeMapId_2014': mapid_2014['mapid'],
-        'eeToken_2014': mapid_2014['token'],
-        #'eeMapId_2015': mapid_2015['mapid'],
-        #'eeToken_2015': mapid_2015['token'],
-        #'eeMapId_2016': mapid_2016['mapid'],
-        #'eeToken_2016': mapid_2016['token'],
-        'serializedPolygonIds': json.dumps(POLYGON_IDS)
-    }
+    template_values = {'serializedPolygonIds': json.dumps(POLYGON_IDS)}
+    for year in MAP_YEARS:
+      mapid = GetTrendyMapId(year)
+      if mapid is None:
+        # Leave the year's layer blank rather than failing the whole page.
+        mapid = {'mapid': '', 'token': ''}
+      template_values['eeMapId_%d' % year] = mapid['mapid']
+      template_values['eeToken_%d' % year] = mapid['token']
     template = JINJA2_ENVIRONMENT.get_template('index.html')
     self.response.out.write(template.render(template_values))
 
@@ -174,10 +130,6 @@ def cloudBand(image):
 def cloudBandF(image):
     return cloudBand(image)
 
-# Add these two lines for each year below. Beware of leftField differences, see 2004	
-#innerJoin = ee.Join.inner();
-#filterTimeEq = ee.Filter.equals({leftField: 'system:time_start', rightField: 'system:time_start'});
-
 def MergeBands(element):
     return ee.Image.cat(element.get('primary'), element.get('secondary'))
 
@@ -195,347 +147,102 @@ def cloudMaskF(image):
 
 def unmaski(image):
     return image.unmask()	
-	
-def GetTrendyMapId_2000():
-
-	start_date = '2000-01-01';
-	end_date = '2000-12-31';
-	llanos = ee.FeatureCollection('ft:1X_CeRfYiZ_4F-G9cu78pxjKTI_xD6yHeFiLvVOki');
-	
-	toaL7 = ee.ImageCollection('LANDSAT/LE7_L1T_TOA').filterDate(start_date, end_date).filterBounds(llanos).filter(ee.Filter.Or(ee.Filter.And(ee.Filter.eq('WRS_PATH', 4), ee.Filter.eq('WRS_ROW', 56)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 4), ee.Filter.eq('WRS_ROW', 57)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 5), ee.Filter.eq('WRS_ROW', 55)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 5), ee.Filter.eq('WRS_ROW', 56)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 6), ee.Filter.eq('WRS_ROW', 55)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 6), ee.Filter.eq('WRS_ROW', 56)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 6), ee.Filter.eq('WRS_ROW', 57)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 7), ee.Filter.eq('WRS_ROW', 56)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 7), ee.Filter.eq('WRS_ROW', 57)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 7), ee.Filter.eq('WRS_ROW', 58))));
-	toaL5 = ee.ImageCollection('LANDSAT/LT5_L1T_TOA').filterDate(start_date, end_date).filterBounds(llanos).filter(ee.Filter.Or(ee.Filter.And(ee.Filter.eq('WRS_PATH', 5), ee.Filter.eq('WRS_ROW', 57)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 6), ee.Filter.eq('WRS_ROW', 58))));
-	srL7 = ee.ImageCollection('LEDAPS/LE7_L1T_SR').filterDate(start_date, end_date).filterBounds(llanos).filter(ee.Filter.Or(ee.Filter.And(ee.Filter.eq('WRS_PATH', 4), ee.Filter.eq('WRS_ROW', 56)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 4), ee.Filter.eq('WRS_ROW', 57)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 5), ee.Filter.eq('WRS_ROW', 55)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 5), ee.Filter.eq('WRS_ROW', 56)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 6), ee.Filter.eq('WRS_ROW', 55)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 6), ee.Filter.eq('WRS_ROW', 56)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 6), ee.Filter.eq('WRS_ROW', 57)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 7), ee.Filter.eq('WRS_ROW', 56)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 7), ee.Filter.eq('WRS_ROW', 57)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 7), ee.Filter.eq('WRS_ROW', 58))));
-	srL5 = ee.ImageCollection('LEDAPS/LT5_L1T_SR').filterDate(start_date, end_date).filterBounds(llanos).filter(ee.Filter.Or(ee.Filter.And(ee.Filter.eq('WRS_PATH', 5), ee.Filter.eq('WRS_ROW', 57)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 6), ee.Filter.eq('WRS_ROW', 58))));
-	
-	cloudTOAL7 = toaL7.map(cloudBandF);
-	cloudTOAL5 = toaL5.map(cloudBandF);
-	
-	innerJoinedL7 = ee.Join.inner().apply(cloudTOAL7.select('cloud'), srL7, ee.Filter.equals(leftField = 'system:time_start', rightField = 'system:time_start')).map(MergeBands).map(ndviAdd);
-	innerJoinedL5 = ee.Join.inner().apply(cloudTOAL5.select('cloud'), srL5, ee.Filter.equals(leftField = 'system:time_start', rightField = 'system:time_start')).map(MergeBands).map(ndviAdd);
-	
-	maskedColl7 = innerJoinedL7.map(cloudMaskF);
-	maskedColl5 = innerJoinedL5.map(cloudMaskF);
-
-	maxValueComposite7 = ee.ImageCollection(maskedColl7).qualityMosaic('NDVI');
-	maxValueComposite5 = ee.ImageCollection(maskedColl5).qualityMosaic('NDVI');
-	maxValueComposite = ee.ImageCollection.fromImages([maxValueComposite5, maxValueComposite7]).mosaic();
-	
-	llanos7 = ee.ImageCollection(maskedColl7).filter(ee.Filter.Or(ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70040562000023EDC00'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70040572000023EDC00'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70050552000046EDC00'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70050562000110AGS01'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70060552000005EDC00'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70060562000005EDC00'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70060572000005EDC00'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70070562000348EDC00'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70070572000076EDC00'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70070582000348EDC00')));
-	llanos5 = ee.ImageCollection(maskedColl5).filter(ee.Filter.Or(ee.Filter.eq('LANDSAT_SCENE_ID', 'LT50050572000278XXX02'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LT50060582000029XXX02')));
-	
-	joinedICs = ee.ImageCollection(llanos5.merge(llanos7));
-	mosaico = joinedICs.map(unmaski).mosaic();
-	nmosaico = mosaico.where(mosaico.eq(0), maxValueComposite);
-
-	return nmosaico.getMapId(vizParams_L5L7)
-
-def GetTrendyMapId_2001():
-
-    image1 = ee.Image('LEDAPS/LE7_L1T_SR/LE70040562001009AGS00');
-    image2 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040572001033XXX01');
-    image3 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050552001008AAA02');
-    image4 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050562001008AAA02');
-    image5 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050572001008AAA02');
-    image6 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060552001031XXX01');
-    image7 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060562001047XXX01');
-    image8 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060572001047XXX01');
-    image9 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060582001031XXX01');
-    image10 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070562001030AGS00');
-    image11 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070572001062EDC00');
-    image12 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070582001062EDC00');
-
-    collection = ee.ImageCollection.fromImages([image1, image2, image3, image4, image5, image6, image7, image8, image9, image10, image11, image12]);
-    return collection.getMapId(vizParams_L5L7)
-
-def GetTrendyMapId_2002():
-
-    image1 = ee.Image('LEDAPS/LE7_L1T_SR/LE70040562002332EDC00');
-    image2 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040572002004CUB00');
-    image3 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050552002051AGS00');
-    image4 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050562002003EDC00');
-    image5 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050572002003EDC00');
-    image6 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060552002026AGS00');
-    image7 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060562002026AGS00');
-    image8 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060572002362AGS01');
-    image9 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060582002362AGS01');
-    image10 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070562002017EDC01');
-    image11 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070572002017EDC01');
-    image12 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070582002273EDC00');
-
-    collection = ee.ImageCollection.fromImages([image1, image2, image3, image4, image5, image6, image7, image8, image9, image10, image11, image12]);
-    return collection.getMapId(vizParams_L5L7)
-
-def GetTrendyMapId_2003():
-
-    image1 = ee.Image('LEDAPS/LE7_L1T_SR/LE70040562003031PFS00');
-    image2 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040572003359CUB00');
-    image3 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050552003006PFS00');
-    image4 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050562003022PFS00');
-    image5 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050572003022PFS00');
-    image6 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060552003045AGS00');
-    image7 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060562003013EDC00');
-    image8 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060572003045EDC01');
-    image9 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060582003013PFS00');
-    image10 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070562003004AGS00');
-    image11 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070572003004AGS00');
-    image12 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070582003004AGS00');
-
-    collection = ee.ImageCollection.fromImages([image1, image2, image3, image4, image5, image6, image7, image8, image9, image10, image11, image12]);
-    return collection.getMapId(vizParams_L5L7)
-
-def GetTrendyMapId_2004():
-
-	start_date = '2004-01-01';
-	end_date = '2004-12-31';
-	llanos = ee.FeatureCollection('ft:1X_CeRfYiZ_4F-G9cu78pxjKTI_xD6yHeFiLvVOki');
-	
-	toaL7 = ee.ImageCollection('LANDSAT/LE7_L1T_TOA').filterDate(start_date, end_date).filterBounds(llanos).filter(ee.Filter.Or(ee.Filter.And(ee.Filter.eq('WRS_PATH', 5), ee.Filter.eq('WRS_ROW', 55)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 5), ee.Filter.eq('WRS_ROW', 56)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 6), ee.Filter.eq('WRS_ROW', 55)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 6), ee.Filter.eq('WRS_ROW', 56)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 6), ee.Filter.eq('WRS_ROW', 57)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 7), ee.Filter.eq('WRS_ROW', 56)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 7), ee.Filter.eq('WRS_ROW', 57)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 7), ee.Filter.eq('WRS_ROW', 58))));
-	toaL5 = ee.ImageCollection('LANDSAT/LT5_L1T_TOA').filterDate(start_date, end_date).filterBounds(llanos).filter(ee.Filter.Or(ee.Filter.And(ee.Filter.eq('WRS_PATH', 4), ee.Filter.eq('WRS_ROW', 56)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 4), ee.Filter.eq('WRS_ROW', 57)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 5), ee.Filter.eq('WRS_ROW', 57)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 6), ee.Filter.eq('WRS_ROW', 58))));
-	srL7 = ee.ImageCollection('LEDAPS/LE7_L1T_SR').filterDate(start_date, end_date).filterBounds(llanos).filter(ee.Filter.Or(ee.Filter.And(ee.Filter.eq('WRS_PATH', 5), ee.Filter.eq('WRS_ROW', 55)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 5), ee.Filter.eq('WRS_ROW', 56)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 6), ee.Filter.eq('WRS_ROW', 55)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 6), ee.Filter.eq('WRS_ROW', 56)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 6), ee.Filter.eq('WRS_ROW', 57)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 7), ee.Filter.eq('WRS_ROW', 56)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 7), ee.Filter.eq('WRS_ROW', 57)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 7), ee.Filter.eq('WRS_ROW', 58))));
-	srL5 = ee.ImageCollection('LEDAPS/LT5_L1T_SR').filterDate(start_date, end_date).filterBounds(llanos).filter(ee.Filter.Or(ee.Filter.And(ee.Filter.eq('WRS_PATH', 4), ee.Filter.eq('WRS_ROW', 56)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 4), ee.Filter.eq('WRS_ROW', 57)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 5), ee.Filter.eq('WRS_ROW', 57)), ee.Filter.And(ee.Filter.eq('WRS_PATH', 6), ee.Filter.eq('WRS_ROW', 58))));
-	
-	cloudTOAL7 = toaL7.map(cloudBandF);
-	cloudTOAL5 = toaL5.map(cloudBandF);
-	
-	#innerJoinedL7 = innerJoin.apply(cloudTOAL7.select('cloud'), srL7, filterTimeEq).map(MergeBands).map(ndviAdd);
-	# Note la diferencia en leftField = sin corchete, con respecto a la version de JavaScript
-	innerJoinedL7 = ee.Join.inner().apply(cloudTOAL7.select('cloud'), srL7, ee.Filter.equals(leftField = 'system:time_start', rightField = 'system:time_start')).map(MergeBands).map(ndviAdd);
-	innerJoinedL5 = ee.Join.inner().apply(cloudTOAL5.select('cloud'), srL5, ee.Filter.equals(leftField = 'system:time_start', rightField = 'system:time_start')).map(MergeBands).map(ndviAdd);
-	
-	maskedColl7 = innerJoinedL7.map(cloudMaskF);
-	maskedColl5 = innerJoinedL5.map(cloudMaskF);
-
-	maxValueComposite7 = ee.ImageCollection(maskedColl7).qualityMosaic('NDVI');
-	maxValueComposite5 = ee.ImageCollection(maskedColl5).qualityMosaic('NDVI');
-	maxValueComposite = ee.ImageCollection.fromImages([maxValueComposite5, maxValueComposite7]).mosaic();
-	
-	llanos7 = ee.ImageCollection(maskedColl7).filter(ee.Filter.Or(ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70050552004041EDC01'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70050562004041EDC01'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70060552004032EDC01'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70060562004032EDC01'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70060572004032EDC01'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70070562004359EDC00'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70070572004039EDC02'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LE70070582004023ASN01')));
-	llanos5 = ee.ImageCollection(maskedColl5).filter(ee.Filter.Or(ee.Filter.eq('LANDSAT_SCENE_ID', 'LT50040562004026CUB00'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LT50040572004026CUB00'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LT50050572004033CUB00'), ee.Filter.eq('LANDSAT_SCENE_ID', 'LT50060582004040CUB00')));
-	
-	joinedICs = ee.ImageCollection(llanos5.merge(llanos7));
-	mosaico = joinedICs.map(unmaski).mosaic();
-	nmosaico = mosaico.where(mosaico.eq(0), maxValueComposite);
-
-	return nmosaico.getMapId(vizParams_L5L7)
-
-def GetTrendyMapId_2005():
-
-    image1 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040562005012CUB01');
-    image2 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040572005012CUB01');
-    image3 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050552005059ASN00');
-    image4 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050562005363EDC00');
-    image5 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050572005307CUB00');
-    image6 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060552005114EDC00');
-    image7 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060562005194ASN00');
-    image8 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060572005194ASN00');
-    image9 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060582005026CUB01');
-    image10 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070562005073EDC00');
-    image11 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070572005073EDC00');
-    image12 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070582005073EDC00');
-
-    collection = ee.ImageCollection.fromImages([image1, image2, image3, image4, image5, image6, image7, image8, image9, image10, image11, image12]);
-    return collection.getMapId(vizParams_L5L7)
-    
-def GetTrendyMapId_2006():
-
-    image1 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040562006351CUB00');
-    image2 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040572006335CUB00');
-    image3 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050552006062EDC00');
-    image4 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050562006142EDC00');
-    image5 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050572006038CUB00');
-    image6 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060552006037EDC00');
-    image7 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060562006037EDC00');
-    image8 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060572006101ASN00');
-    image9 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060582006045CUB00');
-    image10 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070562006140EDC00');
-    image11 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070572006140EDC00');
-    image12 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070582006044ASN00');
-
-    collection = ee.ImageCollection.fromImages([image1, image2, image3, image4, image5, image6, image7, image8, image9, image10, image11, image12]);
-    return collection.getMapId(vizParams_L5L7)
-    
-def GetTrendyMapId_2007():
-
-    image1 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040562007050CUB01');
-    image2 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040572007050CUB01');
-    image3 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050552007033EDC00');
-    image4 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050562007049EDC00');
-    image5 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050572007009CUB00');
-    image6 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060552007024EDC00');
-    image7 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060562007344EDC00');
-    image8 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060572007344EDC00');
-    image9 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060582007016CUB00');
-    image10 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070562007031EDC00');
-    image11 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070572007031EDC00');
-    image12 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070582007047EDC00');
-
-    collection = ee.ImageCollection.fromImages([image1, image2, image3, image4, image5, image6, image7, image8, image9, image10, image11, image12]);
-    return collection.getMapId(vizParams_L5L7)
-
-def GetTrendyMapId_2008():
-
-    image1 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040562008021CUB00');
-    image2 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040572008021CUB00');
-    image3 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050552008020EDC00');
-    image4 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050562008020EDC00');
-    image5 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050572008028CUB00');
-    image6 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060552008107EDC00');
-    image7 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060562008363EDC00');
-    image8 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060572008027EDC00');
-    image9 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060582008099CUB00');
-    image10 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070562008002EDC00');
-    image11 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070572008018EDC00');
-    image12 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070582008002EDC00');
-
-    collection = ee.ImageCollection.fromImages([image1, image2, image3, image4, image5, image6, image7, image8, image9, image10, image11, image12]);
-    return collection.getMapId(vizParams_L5L7)
-
-def GetTrendyMapId_2009():
-
-    image1 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040562009311CUB00');
-    image2 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040572009311CUB00');
-    image3 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050552009334CHM01');
-    image4 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050562009334CHM01');
-    image5 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050572009094CUB00');
-    image6 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060552009013EDC00');
-    image7 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060562009205ASN00');
-    image8 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060572009365EDC01');
-    image9 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060582009069CUB00');
-    image10 = ee.Image('LEDAPS/LT5_L1T_SR/LT50070562009348CHM00');
-    image11 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070572009052EDC00');
-    image12 = ee.Image('LEDAPS/LT5_L1T_SR/LT50070582009252CHM00');
-
-    collection = ee.ImageCollection.fromImages([image1, image2, image3, image4, image5, image6, image7, image8, image9, image10, image11, image12]);
-    return collection.getMapId(vizParams_L5L7)
-
-def GetTrendyMapId_2010():
-
-    image1 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040562010042CHM00');
-    image2 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040572010042CUB01');
-    image3 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050552010009EDC00');
-    image4 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050562010009EDC00');
-    image5 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050572010017CUB00');
-    image6 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060552010056CHM00');
-    image7 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060562010048ASN00');
-    image8 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060572010112EDC00');
-    image9 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060582010024CUB00');
-    image10 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070562010343EDC00');
-    image11 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070572010023EDC00');
-    image12 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070582010023EDC00');
-
-    collection = ee.ImageCollection.fromImages([image1, image2, image3, image4, image5, image6, image7, image8, image9, image10, image11, image12]);
-    return collection.getMapId(vizParams_L5L7)
-
-def GetTrendyMapId_2011():
-
-    image1 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040562011013CUB00');
-    image2 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040572011013CUB00');
-    image3 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050552011044EDC00');
-    image4 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050562011012EDC00');
-    image5 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050572011036CUB00');
-    image6 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060552011091CHM00');
-    image7 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060562011019EDC00');
-    image8 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060572011019EDC00');
-    image9 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060582011219CUB00');
-    image10 = ee.Image('LEDAPS/LT5_L1T_SR/LT50070562011098CHM00');
-    image11 = ee.Image('LEDAPS/LT5_L1T_SR/LT50070572011114CHM00');
-    image12 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070582011074EDC00');
-
-    collection = ee.ImageCollection.fromImages([image1, image2, image3, image4, image5, image6, image7, image8, image9, image10, image11, image12]);
-    return collection.getMapId(vizParams_L5L7)
-
-def GetTrendyMapId_2012():
-
-    image1 = ee.Image('LEDAPS/LE7_L1T_SR/LE70040562012008EDC00');
-    image2 = ee.Image('LEDAPS/LE7_L1T_SR/LE70040572012264ASN00');
-    image3 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050552012047EDC00');
-    image4 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050562012047EDC00');
-    image5 = ee.Image('LEDAPS/LE7_L1T_SR/LE70050572012351EDC00');
-    image6 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060552012022EDC00');
-    image7 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060562012022EDC00');
-    image8 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060572012022EDC00');
-    image9 = ee.Image('LEDAPS/LE7_L1T_SR/LE70060582012022EDC00');
-    image10 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070562012301ASN00');
-    image11 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070572012253EDC00');
-    image12 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070582012253EDC00');
-
-    collection = ee.ImageCollection.fromImages([image1, image2, image3, image4, image5, image6, image7, image8, image9, image10, image11, image12]);
-    return collection.getMapId(vizParams_L5L7)
-
-    
-def GetTrendyMapId_2013():
-
-    image1 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80040562013354LGN00');
-    image2 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80040572013354LGN00');
-    image3 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80050552013361LGN00');
-    image4 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80050562013297LGN00');
-    image5 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80050572013297LGN00');
-    image6 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80060552013160LGN00');
-    image7 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80060562013256LGN00');
-    image8 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80060572013256LGN00');
-    image9 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80060582013256LGN00');
-    image10 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80070562013279LGN01');
-    image11 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80070572013167LGN00');
-    image12 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80070582013167LGN00');
-
-    collection = ee.ImageCollection.fromImages([image1, image2, image3, image4, image5, image6, image7, image8, image9, image10, image11, image12]);
-    return collection.getMapId(vizParams_L8)
-
-def GetTrendyMapId_2014():
-
-    image1 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80040562014021LGN00');
-    image2 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80040572014021LGN00');
-    image3 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80050552014028LGN00');
-    image4 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80050562014028LGN00');
-    image5 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80050572014028LGN00');
-    image6 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80060552014243LGN00');
-    image7 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80060562014243LGN00');
-    image8 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80060572014051LGN00');
-    image9 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80060582014035LGN00');
-    image10 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80070562014090LGN00');
-    image11 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80070572014090LGN00');
-    image12 = ee.Image('LANDSAT/LC8_L1T_TOA/LC80070582014090LGN00');
-
-    collection = ee.ImageCollection.fromImages([image1, image2, image3, image4, image5, image6, image7, image8, image9, image10, image11, image12]);
-    return collection.getMapId(vizParams_L8)
 
-"""
-def GetTrendyMapId_2015():
-
-    image1 = ee.Image('LEDAPS/LE7_L1T_SR/LE70040562001009AGS00');
-    image2 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040572001033XXX01');
-    image3 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050552001008AAA02');
-    image4 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050562001008AAA02');
-    image5 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050572001008AAA02');
-    image6 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060552001031XXX01');
-    image7 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060562001047XXX01');
-    image8 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060572001047XXX01');
-    image9 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060582001031XXX01');
-    image10 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070562001030AGS00');
-    image11 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070572001062EDC00');
-    image12 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070582001062EDC00');
-
-    collection = ee.ImageCollection.fromImages([image1, image2, image3, image4, image5, image6, image7, image8, image9, image10, image11, image12]);
-    return collection.getMapId(vizParams_L5L7)
-    
-def GetTrendyMapId_2016():
-
-    image1 = ee.Image('LEDAPS/LE7_L1T_SR/LE70040562001009AGS00');
-    image2 = ee.Image('LEDAPS/LT5_L1T_SR/LT50040572001033XXX01');
-    image3 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050552001008AAA02');
-    image4 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050562001008AAA02');
-    image5 = ee.Image('LEDAPS/LT5_L1T_SR/LT50050572001008AAA02');
-    image6 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060552001031XXX01');
-    image7 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060562001047XXX01');
-    image8 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060572001047XXX01');
-    image9 = ee.Image('LEDAPS/LT5_L1T_SR/LT50060582001031XXX01');
-    image10 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070562001030AGS00');
-    image11 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070572001062EDC00');
-    image12 = ee.Image('LEDAPS/LE7_L1T_SR/LE70070582001062EDC00');
-
-    collection = ee.ImageCollection.fromImages([image1, image2, image3, image4, image5, image6, image7, image8, image9, image10, image11, image12]);
-    return collection.getMapId(vizParams_L5L7)
-"""    
+
+def GetTrendyMapId(year):
+  """Returns the EE map ID of the Landsat mosaic for the given year.
+
+  The scenes come from the local scene catalog: the clearest scene of the year
+  for each path/row. Only their IDs are sent to EE. Returns None if the catalog
+  has no scenes for the year.
+  """
+  if year in GAP_FILLED_YEARS:
+    return GetGapFilledMapId(year)
+  if year >= L8_FIRST_YEAR:
+    sensors, viz_params = L8_SENSORS, vizParams_L8
+  else:
+    sensors, viz_params = L5L7_SENSORS, vizParams_L5L7
+  scenes = GetBestScenes(year, sensors)
+  if not scenes:
+    return None
+  images = [ee.Image(scene_catalog.MAP_COLLECTION_IDS[scene.sensor] + '/' +
+                     scene.scene_id)
+            for scene in scenes]
+  collection = ee.ImageCollection.fromImages(images)
+  return collection.getMapId(viz_params)
+
+
+def GetGapFilledMapId(year):
+  """Returns the EE map ID of a year's cloud-masked, gap-filled mosaic.
+
+  Cloudy pixels of the year's best scenes are filled in from a max-NDVI
+  composite of all of that year's Landsat 5 and 7 scenes. See
+  GetFillCollections(). Returns None if the catalog has no scenes for the year.
+  """
+  best_ids = [scene.scene_id for scene in GetBestScenes(year, L5L7_SENSORS)]
+  if not best_ids:
+    return None
+  # A catalog holding only the best scenes (like the checked-in seed) has
+  # nothing to fill their cloud holes with, so search the archive instead.
+  use_catalog = len(SCENE_CATALOG.SceneIds(year, L5L7_SENSORS)) > len(best_ids)
+
+  masked = []
+  for sensor in L5L7_SENSORS:
+    toa, sr = GetFillCollections(year, sensor, use_catalog)
+    cloud_toa = toa.map(cloudBandF)
+    # Note la diferencia en leftField = sin corchete, con respecto a la version de JavaScript
+    joined = ee.Join.inner().apply(cloud_toa.select('cloud'), sr, ee.Filter.equals(leftField = 'system:time_start', rightField = 'system:time_start')).map(MergeBands).map(ndviAdd)
+    masked.append(ee.ImageCollection(joined.map(cloudMaskF)))
+
+  maxValueComposite = ee.ImageCollection.fromImages(
+      [coll.qualityMosaic('NDVI') for coll in masked]).mosaic()
+
+  best = ee.ImageCollection(masked[0].merge(masked[1])).filter(
+      ee.Filter.inList('LANDSAT_SCENE_ID', best_ids))
+  mosaico = best.map(unmaski).mosaic()
+  nmosaico = mosaico.where(mosaico.eq(0), maxValueComposite)
+  return nmosaico.getMapId(vizParams_L5L7)
+
+
+def GetFillCollections(year, sensor, use_catalog):
+  """Returns the TOA and SR collections of a sensor's scenes in a year.
+
+  With use_catalog, these are the sensor's catalog scenes for the year, sent to
+  EE as explicit IDs. Otherwise they are all of the year's scenes over the
+  Llanos path/rows in the EE archive.
+  """
+  toa_collection_id = scene_catalog.TOA_COLLECTION_IDS[sensor]
+  sr_collection_id = scene_catalog.MAP_COLLECTION_IDS[sensor]
+  if use_catalog:
+    scene_ids = SCENE_CATALOG.SceneIds(year, [sensor])
+    toa = ee.ImageCollection.fromImages(
+        [ee.Image(toa_collection_id + '/' + scene_id) for scene_id in scene_ids])
+    sr = ee.ImageCollection.fromImages(
+        [ee.Image(sr_collection_id + '/' + scene_id) for scene_id in scene_ids])
+    return toa, sr
+
+  path_row_filter = ee.Filter.Or(*[
+      ee.Filter.And(ee.Filter.eq('WRS_PATH', path), ee.Filter.eq('WRS_ROW', row))
+      for path, row in scene_catalog.LLANOS_PATH_ROWS])
+  start_date = '%d-01-01' % year
+  end_date = '%d-01-01' % (year + 1)
+  toa = ee.ImageCollection(toa_collection_id).filterDate(
+      start_date, end_date).filter(path_row_filter)
+  sr = ee.ImageCollection(sr_collection_id).filterDate(
+      start_date, end_date).filter(path_row_filter)
+  return toa, sr
+
+
+def GetBestScenes(year, sensors):
+  """Returns the year's best catalog scenes, logging any uncovered path/rows."""
+  scenes = SCENE_CATALOG.BestScenes(year, sensors)
+  covered = set((scene.path, scene.row) for scene in scenes)
+  missing = [path_row for path_row in scene_catalog.LLANOS_PATH_ROWS
+             if path_row not in covered]
+  if missing:
+    logging.warning('The scene catalog has no %d scene for path/rows %s.',
+                    year, missing)
+  return scenes
 
 
 def GetValueAtPoint(lat, lon):
@@ -629,6 +336,21 @@ WIKI_URL = 'http://en.wikipedia.org/wiki/'
 vizParams_L5L7 = {'min':0,'max':4000, 'bands': 'B4,B5,B3'}
 vizParams_L8 = {'min':0,'max':0.4, 'bands': 'B5,B6,B4'}
 
+# The years with a Landsat mosaic on the map.
+MAP_YEARS = range(scene_catalog.FIRST_YEAR, scene_catalog.LAST_YEAR + 1)
+
+# The years whose mosaics are cloud-masked and gap-filled. See
+# GetGapFilledMapId().
+GAP_FILLED_YEARS = (2000, 2004)
+
+# From this year on the mosaics are made of Landsat 8 scenes only.
+L8_FIRST_YEAR = 2013
+
+# The sensors whose scenes make up the mosaics before and after L8_FIRST_YEAR.
+# Landsat 8 scenes are TOA rather than SR, so they are never mixed with these.
+L5L7_SENSORS = ('LT5', 'LE7')
+L8_SENSORS = ('LC8',)
+
 ###############################################################################
 #                               Initialization.                               #
 ###############################################################################
@@ -641,6 +363,17 @@ EE_CREDENTIALS = ee.ServiceAccountCredentials(
 # Read the polygon IDs from the file system.
 POLYGON_IDS = [name.replace('.json', '') for name in os.listdir(POLYGON_PATH)]
 
+# Load the scene catalog once per instance; it is refreshed offline by running
+# sync_catalog.py, never while handling a request. Without a catalog the
+# Landsat layers are left blank but the rest of the app keeps working.
+try:
+  SCENE_CATALOG = scene_catalog.Load(scene_catalog.CATALOG_PATH)
+except (IOError, ValueError, KeyError) as e:
+  logging.error('Could not load the scene catalog from %s: %s. '
+                'Run sync_catalog.py to rebuild it.',
+                scene_catalog.CATALOG_PATH, e)
+  SCENE_CATALOG = scene_catalog.SceneCatalog([])
+
 # Create the Jinja templating system we use to dynamically generate HTML. See:
 # http://jinja.pocoo.org/docs/dev/
 JINJA2_ENVIRONMENT = jinja2.Environment(
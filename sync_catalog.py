@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""Refreshes the local Landsat scene catalog used by server.py.
+
+The web server picks its scenes from scene_catalog.json and never searches the
+Landsat archive while handling a request. Run this command whenever the
+catalog should pick up newly ingested scenes or updated cloud scores:
+
+    python sync_catalog.py
+
+It uses the same service account as the server (see config.py) and asks
+Earth Engine for the metadata of every scene over the Llanos path/rows in the
+years the app shows. See scene_catalog.py for the catalog format.
+"""
+
+import datetime
+
+import config
+import ee
+import scene_catalog
+
+###############################################################################
+#                                   Constants.                                #
+###############################################################################
+
+
+# The scene metadata properties fetched for each catalog row. The sensor
+# column isn't fetched; it comes from the collection the scene is read from.
+SCENE_PROPERTIES = [
+    'LANDSAT_SCENE_ID', 'WRS_PATH', 'WRS_ROW', 'DATE_ACQUIRED', 'CLOUD_COVER'
+]
+
+
+###############################################################################
+#                                   Helpers.                                  #
+###############################################################################
+
+
+def GetLlanosCollection(collection_id):
+  """Returns the scenes of an EE collection over the Llanos path/rows."""
+  path_row_filter = ee.Filter.Or(*[
+      ee.Filter.And(ee.Filter.eq('WRS_PATH', path), ee.Filter.eq('WRS_ROW', row))
+      for path, row in scene_catalog.LLANOS_PATH_ROWS])
+  return (ee.ImageCollection(collection_id)
+          .filterDate('%d-01-01' % scene_catalog.FIRST_YEAR,
+                      '%d-01-01' % (scene_catalog.LAST_YEAR + 1))
+          .filter(path_row_filter))
+
+
+def GetSceneIds(collection_id):
+  """Returns the set of scene IDs in a collection over the Llanos."""
+  ids = GetLlanosCollection(collection_id).reduceColumns(
+      ee.Reducer.toList(), ['system:index']).get('list')
+  return set(ids.getInfo())
+
+
+def GetSensorScenes(sensor):
+  """Returns the Scenes of one sensor over the Llanos path/rows.
+
+  Scene metadata comes from the sensor's TOA collection. When the map shows
+  another collection (LEDAPS SR for Landsat 5 and 7), only the scenes that
+  also exist there are kept, so the server never picks a scene it can't show.
+  """
+  toa_collection_id = scene_catalog.TOA_COLLECTION_IDS[sensor]
+  map_collection_id = scene_catalog.MAP_COLLECTION_IDS[sensor]
+  # reduceColumns() skips images with a missing property, so give unscored
+  # scenes an explicit cloud cover instead of losing them.
+  rows = GetLlanosCollection(toa_collection_id).map(SetDefaultCloudCover)
+  rows = rows.reduceColumns(
+      ee.Reducer.toList(len(SCENE_PROPERTIES)), SCENE_PROPERTIES).get('list')
+  map_ids = None
+  if map_collection_id != toa_collection_id:
+    map_ids = GetSceneIds(map_collection_id)
+
+  scenes = []
+  for scene_id, path, row, date, cloud in rows.getInfo():
+    if map_ids is not None and scene_id not in map_ids:
+      continue
+    scenes.append(scene_catalog.Scene(
+        scene_id=scene_id,
+        sensor=sensor,
+        path=int(path),
+        row=int(row),
+        date=datetime.datetime.strptime(date, '%Y-%m-%d').date(),
+        cloud=GetCloudScore(cloud)))
+  return scenes
+
+
+def SetDefaultCloudCover(image):
+  """Sets an image's CLOUD_COVER to UNKNOWN_CLOUD if it has none."""
+  has_cloud_cover = image.propertyNames().contains('CLOUD_COVER')
+  return image.set('CLOUD_COVER', ee.Algorithms.If(
+      has_cloud_cover, image.get('CLOUD_COVER'), scene_catalog.UNKNOWN_CLOUD))
+
+
+def GetCloudScore(cloud_cover):
+  """Returns the catalog cloud score for a scene's CLOUD_COVER property."""
+  if cloud_cover < 0:
+    return scene_catalog.UNKNOWN_CLOUD
+  return float(cloud_cover)
+
+
+def SyncCatalog():
+  """Fetches the scene metadata from EE and rewrites the catalog file."""
+  scenes = []
+  for sensor in scene_catalog.SENSORS:
+    sensor_scenes = GetSensorScenes(sensor)
+    print('%s: %d scenes' % (sensor, len(sensor_scenes)))
+    scenes.extend(sensor_scenes)
+  scene_catalog.Save(scenes, scene_catalog.CATALOG_PATH)
+  print('Wrote %d scenes to %s' % (len(scenes), scene_catalog.CATALOG_PATH))
+
+
+###############################################################################
+#                                    Main.                                    #
+###############################################################################
+
+
+if __name__ == '__main__':
+  ee.Initialize(ee.ServiceAccountCredentials(
+      config.EE_ACCOUNT, config.EE_PRIVATE_KEY_FILE))
+  SyncCatalog()